@@ -13,23 +13,105 @@ Usage:
 The script can be run from any working directory and has no external dependencies.
 """
 
+import functools
+import hashlib
+import json
 import os
 import re
+import string
 import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Set, Tuple, Optional
-
-# Check for markdown library
-try:
-    import markdown
-    MARKDOWN_AVAILABLE = True
-except ImportError:
-    MARKDOWN_AVAILABLE = False
+from html import escape as html_escape
+
+# Precompiled patterns (compiled once at import instead of per call).
+# The file-scanning patterns are bytes patterns: input files are read in
+# binary and scanned without decoding; only the captured groups (requirement
+# IDs, method names, short text spans) are decoded. The patterns are pure
+# ASCII, so they match UTF-8 content byte-for-byte.
+# Requirement block: "- **TOR-1.1**: description" at line start plus all of
+# its metadata sub-bullets, up to the next requirement bullet or end of file
+_BLOCK_RE = re.compile(
+    rb'^-\s*\*\*([A-Z]+-[\d.]+)\*\*:\s*(.+?)(?=\n-\s*\*\*[A-Z]+-[\d.]+\*\*|\Z)',
+    re.MULTILINE | re.DOTALL)
+# Metadata sub-bullets under a requirement
+_PRIORITY_RE = re.compile(rb'\s*-\s*\*\*Priority\*\*:\s*(.+)')
+_IMPL_RE = re.compile(rb'\s*-\s*\*\*Impl Status\*\*:\s*(.+)')
+# Combined test-file pattern: one pass over the whole file buffer finds both
+# test method definitions and requirement ID comments (// TOR-1.1 or
+# // TOR-1.1, TOR-2.3), in document order, instead of running two regexes
+# against every line.
+_COMBINED_RE = re.compile(
+    rb'(?P<method>public\s+(?:async\s+)?Task\s+(\w+)\s*\()'
+    rb'|(?P<req>//\s*([A-Z]+-[\d.]+(?:\s*,\s*[A-Z]+-[\d.]+)*))',
+    re.MULTILINE)
+# Strips all metadata bullets from a requirement description in one pass
+_CLEANUP_RE = re.compile(r'\s*-\s*\*\*(?:Priority|Impl Status|Verification)\*\*:[^-]*')
+
+# Escapes pipe characters for markdown table cells; a translate table is
+# faster than str.replace for single-character substitutions.
+_PIPE_ESCAPE = str.maketrans({'|': '\\|'})
+
+# Inline markdown used in requirement descriptions; applied to HTML cells
+# after entity escaping so only our own tags survive.
+_CODE_SPAN_RE = re.compile(r'`([^`]+)`')
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_EMPHASIS_RE = re.compile(r'\*([^*]+)\*')
+
+# Cell text emitted when a requirement has no covering test
+_NO_COVERAGE = '❌ No test coverage'
+
+# Output skeletons live alongside the script and are parsed once at import.
+# string.Template substitutes $placeholders, so the large CSS/JS block needs
+# no brace escaping and the skeletons stay editable as plain files.
+_TEMPLATE_DIR = Path(__file__).parent / "templates"
+_MD_TEMPLATE = string.Template((_TEMPLATE_DIR / "trace_matrix.md.tmpl").read_text(encoding='utf-8'))
+_HTML_TEMPLATE = string.Template((_TEMPLATE_DIR / "trace_matrix.html.tmpl").read_text(encoding='utf-8'))
+
+
+def _decode(data: bytes) -> str:
+    """
+    Decode a captured byte span. bytes.isascii() is a tight C loop and the
+    ASCII codec skips UTF-8's multi-byte state handling, so probe for the
+    (overwhelmingly common) ASCII case first.
+    """
+    return data.decode('ascii') if data.isascii() else data.decode('utf-8')
 
 
+@dataclass
+class TraceMatrixModel:
+    """
+    Everything the output serializers need, computed once per run. The
+    renderers only format these fields — no recomputation — so the markdown
+    and HTML outputs always agree, including the generation timestamp.
+    Rows are (req_id, priority, impl_status, req_text, file_path,
+    test_method) tuples.
+    """
+    timestamp: str
+    total_requirements: int
+    covered_requirements: int
+    coverage_percentage: float
+    total_implemented: int
+    covered_implemented: int
+    coverage_implemented_percentage: float
+    priority_summary_all: str
+    priority_summary_impl: str
+    priority_summary_all_html: str
+    priority_summary_impl_html: str
+    rows: List[Tuple] = field(default_factory=list)
+
+
+@functools.lru_cache(maxsize=1)
 def find_project_root() -> Path:
-    """Find the project root directory based on the script's location."""
+    """Find the project root directory based on the script's location.
+
+    The result cannot change within a run, so it is cached to avoid
+    repeating the filesystem probes at every call site.
+    """
     # The script is in scripts/ directory, so project root is one level up
     script_dir = Path(__file__).parent  # scripts/
     project_root = script_dir.parent    # project root
@@ -48,8 +130,13 @@ def find_project_root() -> Path:
     return Path.cwd()
 
 
-def parse_requirements(requirements_file: Path) -> Dict[str, str]:
-    """Parse requirements from the operational requirements file."""
+def parse_requirements(requirements_file: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Parse requirements from the operational requirements file.
+    Returns a dict mapping requirement IDs to {'text', 'priority',
+    'impl_status'} dicts, so downstream code reads the fields directly
+    instead of re-extracting them from a flattened string.
+    """
     requirements = {}
     
     if not requirements_file.exists():
@@ -57,48 +144,31 @@ def parse_requirements(requirements_file: Path) -> Dict[str, str]:
         return requirements
     
     try:
-        with open(requirements_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split content into sections and parse each requirement block
-        lines = content.split('\n')
-        current_req_id = None
-        current_req_text = ""
-        current_priority = "Unknown"
-        current_impl_status = "Unknown"
-        
-        for line in lines:
-            # Check for requirement ID line
-            req_match = re.match(r'-\s*\*\*([A-Z]+-[\d.]+)\*\*:\s*(.+)', line)
-            if req_match:
-                # Save previous requirement if exists
-                if current_req_id:
-                    full_description = f"{current_req_text} - **Priority**: {current_priority} - **Impl Status**: {current_impl_status}"
-                    requirements[current_req_id] = full_description.strip()
-                
-                # Start new requirement
-                current_req_id = req_match.group(1)
-                current_req_text = req_match.group(2).strip()
-                current_priority = "Unknown"
-                current_impl_status = "Unknown"
-            
-            # Check for priority line
-            elif current_req_id and re.match(r'\s*-\s*\*\*Priority\*\*:\s*(.+)', line):
-                priority_match = re.match(r'\s*-\s*\*\*Priority\*\*:\s*(.+)', line)
-                if priority_match:
-                    current_priority = priority_match.group(1).strip()
-            
-            # Check for implementation status line
-            elif current_req_id and re.match(r'\s*-\s*\*\*Impl Status\*\*:\s*(.+)', line):
-                impl_match = re.match(r'\s*-\s*\*\*Impl Status\*\*:\s*(.+)', line)
-                if impl_match:
-                    current_impl_status = impl_match.group(1).strip()
-        
-        # Don't forget the last requirement
-        if current_req_id:
-            full_description = f"{current_req_text} - **Priority**: {current_priority} - **Impl Status**: {current_impl_status}"
-            requirements[current_req_id] = full_description.strip()
-        
+        data = requirements_file.read_bytes()
+
+        # One pass over the whole buffer: each match captures a complete
+        # requirement block, and the metadata patterns then only search the
+        # short captured block instead of every line of the file
+        for block_match in _BLOCK_RE.finditer(data):
+            req_id = _decode(block_match.group(1))
+            block = block_match.group(2)
+
+            # Requirement text is the remainder of the ID line; metadata
+            # lives in the sub-bullets below it
+            req_text = _decode(block.split(b'\n', 1)[0]).strip()
+
+            priority_match = _PRIORITY_RE.search(block)
+            priority = _decode(priority_match.group(1)).strip() if priority_match else "Unknown"
+
+            impl_match = _IMPL_RE.search(block)
+            impl_status = _decode(impl_match.group(1)).strip() if impl_match else "Unknown"
+
+            requirements[req_id] = {
+                'text': req_text,
+                'priority': priority,
+                'impl_status': impl_status,
+            }
+
         print(f"Parsed {len(requirements)} requirements from {requirements_file}")
         
     except Exception as e:
@@ -107,637 +177,419 @@ def parse_requirements(requirements_file: Path) -> Dict[str, str]:
     return requirements
 
 
+def _load_scan_cache(cache_file: Path) -> Dict:
+    """Load the per-file scan cache, or an empty cache if missing/corrupt."""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            loaded = json.load(f)
+    except Exception:
+        return {}
+    # A file holding valid JSON of the wrong shape (e.g. a list) must fall
+    # back to a full re-parse rather than poisoning every cache lookup.
+    return loaded if isinstance(loaded, dict) else {}
+
+
+def _cache_entry_valid(cached, key: List) -> bool:
+    """True when a cache entry is a replayable [key, mappings] pair whose
+    mappings are well-formed [relative_path, test_method, req_ids] triples."""
+    if not (isinstance(cached, list) and len(cached) == 2 and cached[0] == key):
+        return False
+    mappings = cached[1]
+    return isinstance(mappings, list) and all(
+        isinstance(mapping, list) and len(mapping) == 3
+        and isinstance(mapping[0], str) and isinstance(mapping[1], str)
+        and isinstance(mapping[2], list)
+        for mapping in mappings)
+
+
+def _extract_mappings(data: bytes, relative_path: str) -> List[List]:
+    """
+    Extract (relative_path, test_method, req_ids) entries from one test file.
+    Entries are JSON-serializable lists so they can be cached as-is.
+    """
+    extracted = []
+    current_test_method = None
+
+    # Single C-level traversal of the raw byte buffer instead of a
+    # Python-level loop running two regexes per line. Only the short
+    # captured groups get decoded.
+    for match in _COMBINED_RE.finditer(data):
+        if match.lastgroup == 'method':
+            current_test_method = _decode(match.group(2))
+        elif current_test_method:
+            # Parse multiple requirement IDs from the comment
+            req_ids = [req_id.strip() for req_id in _decode(match.group(4)).split(',')]
+            extracted.append([relative_path, current_test_method, req_ids])
+
+    return extracted
+
+
+def _scan_one(args: Tuple[str, str]) -> Optional[List[List]]:
+    """
+    Worker: read and extract one test file. Top-level so it pickles for
+    ProcessPoolExecutor; takes/returns plain strings and lists for the
+    same reason.
+    """
+    path_str, relative_path = args
+    try:
+        with open(path_str, 'rb') as f:
+            data = f.read()
+        return _extract_mappings(data, relative_path)
+    except Exception as e:
+        print(f"Error scanning test file {path_str}: {e}")
+        return None
+
+
+# Below this many files to parse, process pool startup costs more than it saves.
+_PARALLEL_THRESHOLD = 32
+
+# Directories that never contain hand-written tests (build output, package
+# restores, IDE state) — pruned before descent to avoid needless stat calls.
+_SKIP_DIRS = frozenset(('bin', 'obj', '.vs', 'packages', 'node_modules', '.git'))
+
+
+def _iter_cs_files(test_directory: Path):
+    """
+    Yield hand-written .cs files under test_directory, pruning build-output
+    directories and skipping generated sources (*.g.cs, *.Designer.cs) that
+    cannot carry requirement ID comments.
+    """
+    for dirpath, dirnames, filenames in os.walk(test_directory):
+        dirnames[:] = sorted(d for d in dirnames if d not in _SKIP_DIRS)
+        for filename in sorted(filenames):
+            if (filename.endswith('.cs')
+                    and not filename.endswith('.g.cs')
+                    and not filename.endswith('.Designer.cs')):
+                yield Path(dirpath) / filename
+
+
 def scan_test_files(test_directories: List[Path]) -> Dict[str, List[Tuple[str, str]]]:
     """
     Scan test files in multiple directories for requirement ID comments.
     Returns a dict mapping requirement IDs to list of (file_path, test_method) tuples.
+
+    Per-file results are memoized in outputs/.trace_cache.json keyed by
+    (mtime_ns, size), so unchanged files are replayed from the cache instead
+    of being re-read and re-parsed on every run. Files that do need parsing
+    are independent of each other, so large batches are fanned out to a
+    process pool (regex + decode are CPU-bound).
     """
-    requirement_tests = {}
-    
+    requirement_tests = defaultdict(set)
+
+    cache_file = find_project_root() / "outputs" / ".trace_cache.json"
+    cache = _load_scan_cache(cache_file)
+    new_cache = {}
+
+    # Walk phase: stat every file, replaying cache hits and collecting the
+    # rest for the parse phase. Entries keep walk order so the merged output
+    # is identical regardless of cache state or parallelism.
+    entries = []      # [path_str, key, extracted or None]
+    to_parse = []     # ((path_str, relative_path), entry index)
+
     for test_directory in test_directories:
         if not test_directory.exists():
             print(f"Warning: Test directory not found at {test_directory}")
             continue
-        
-        # Pattern to match requirement ID comments like // TOR-1.1 or // TOR-1.1, TOR-2.3
-        req_comment_pattern = r'//\s*([A-Z]+-[\d.]+(?:\s*,\s*[A-Z]+-[\d.]+)*)'
-        
-        # Pattern to find test method names
-        test_method_pattern = r'public\s+(?:async\s+)?Task\s+(\w+)\s*\('
-        
-        for test_file in test_directory.glob('**/*.cs'):
+
+        for test_file in _iter_cs_files(test_directory):
             try:
-                with open(test_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                lines = content.split('\n')
-                current_test_method = None
-                
-                for i, line in enumerate(lines):
-                    # Check for test method definition
-                    method_match = re.search(test_method_pattern, line)
-                    if method_match:
-                        current_test_method = method_match.group(1)
-                    
-                    # Check for requirement ID comments
-                    req_match = re.search(req_comment_pattern, line)
-                    if req_match and current_test_method:
-                        # Parse multiple requirement IDs from the comment
-                        req_ids_text = req_match.group(1)
-                        req_ids = [req_id.strip() for req_id in req_ids_text.split(',')]
-                        
-                        relative_path = test_file.relative_to(test_directory.parent.parent)
-                        
-                        for req_id in req_ids:
-                            if req_id not in requirement_tests:
-                                requirement_tests[req_id] = []
-                            
-                            # Avoid duplicates
-                            test_info = (str(relative_path), current_test_method)
-                            if test_info not in requirement_tests[req_id]:
-                                requirement_tests[req_id].append(test_info)
-            
+                st = test_file.stat()
+                key = [st.st_mtime_ns, st.st_size]
+                cached = cache.get(str(test_file))
+
+                if _cache_entry_valid(cached, key):
+                    entries.append([str(test_file), key, cached[1]])
+                else:
+                    relative_path = test_file.relative_to(test_directory.parent.parent)
+                    to_parse.append(((str(test_file), str(relative_path)), len(entries)))
+                    entries.append([str(test_file), key, None])
             except Exception as e:
                 print(f"Error scanning test file {test_file}: {e}")
+
+    # Parse phase: serial for small batches, process pool for large ones.
+    if len(to_parse) >= _PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(_scan_one, [args for args, _ in to_parse], chunksize=8))
+    else:
+        results = [_scan_one(args) for args, _ in to_parse]
+
+    for (_, entry_index), extracted in zip(to_parse, results):
+        entries[entry_index][2] = extracted
+
+    # Merge phase: fold per-file entries into the requirement map and refresh
+    # the cache. Files that failed to parse are skipped and not cached.
+    for path_str, key, extracted in entries:
+        if extracted is None:
+            continue
+
+        new_cache[path_str] = [key, extracted]
+
+        for relative_path, test_method, req_ids in extracted:
+            # Sets dedup in O(1) instead of a linear list scan per match
+            test_info = (relative_path, test_method)
+            for req_id in req_ids:
+                requirement_tests[req_id].add(test_info)
+
+    # Persist the refreshed cache; stale entries for deleted files drop out
+    # because only files seen this run are written back.
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(new_cache, f)
+    except Exception as e:
+        print(f"Warning: Could not write scan cache: {e}")
     
+    # Sorted lists give deterministic output order for the generated matrix
+    requirement_tests = {req_id: sorted(tests) for req_id, tests in requirement_tests.items()}
+
     total_mappings = sum(len(tests) for tests in requirement_tests.values())
     print(f"Found {total_mappings} requirement-to-test mappings across {len(requirement_tests)} requirements")
-    
+
     return requirement_tests
 
 
-def generate_html_trace_matrix(requirements: Dict[str, str], 
-                              requirement_tests: Dict[str, List[Tuple[str, str]]],
-                              html_output_file: Path) -> None:
-    """Generate the requirements trace matrix HTML file with dark theme."""
-    
-    # Ensure output directory exists
-    html_output_file.parent.mkdir(parents=True, exist_ok=True)
-    
+def _build_model(requirements: Dict[str, Dict[str, str]],
+                 requirement_tests: Dict[str, List[Tuple[str, str]]]) -> TraceMatrixModel:
+    """
+    Build the trace matrix model: table rows plus coverage statistics.
+
+    The markdown and HTML outputs share identical row content and summary
+    numbers, so this runs once per invocation and both generators render
+    from the same model.
+    """
     # Calculate coverage statistics
     total_requirements = len(requirements)
     covered_requirements = len([req_id for req_id in requirements.keys() if req_id in requirement_tests])
     coverage_percentage = (covered_requirements / total_requirements * 100) if total_requirements > 0 else 0
-    
-    # Calculate coverage by priority
-    priority_stats = {}
-    for req_id, description in requirements.items():
-        # Extract priority
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        
-        if priority not in priority_stats:
-            priority_stats[priority] = {'total': 0, 'covered': 0}
-        
-        priority_stats[priority]['total'] += 1
-        if req_id in requirement_tests:
-            priority_stats[priority]['covered'] += 1
-    
-    # Calculate stats for implemented requirements
-    implemented_reqs = {req_id: desc for req_id, desc in requirements.items() if "Impl Status**: Implemented" in desc}
-    total_implemented = len(implemented_reqs)
-    covered_implemented = len([req_id for req_id in implemented_reqs.keys() if req_id in requirement_tests])
-    coverage_implemented_percentage = (covered_implemented / total_implemented * 100) if total_implemented > 0 else 0
 
-    # Calculate coverage by priority for all requirements
-    priority_stats_all = {}
-    for req_id, description in requirements.items():
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        if priority not in priority_stats_all:
-            priority_stats_all[priority] = {'total': 0, 'covered': 0}
+    # Calculate overall and per-priority coverage for all requirements and
+    # for the implemented subset in a single pass
+    total_implemented = 0
+    covered_implemented = 0
+    priority_stats_all = defaultdict(lambda: {'total': 0, 'covered': 0})
+    priority_stats_impl = defaultdict(lambda: {'total': 0, 'covered': 0})
+
+    for req_id, req in requirements.items():
+        priority = req['priority']
+        is_covered = req_id in requirement_tests
+
         priority_stats_all[priority]['total'] += 1
-        if req_id in requirement_tests:
+        if is_covered:
             priority_stats_all[priority]['covered'] += 1
 
-    # Calculate coverage by priority for implemented requirements
-    priority_stats_impl = {}
-    for req_id, description in implemented_reqs.items():
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        if priority not in priority_stats_impl:
-            priority_stats_impl[priority] = {'total': 0, 'covered': 0}
-        priority_stats_impl[priority]['total'] += 1
-        if req_id in requirement_tests:
-            priority_stats_impl[priority]['covered'] += 1
+        if req['impl_status'] == 'Implemented':
+            total_implemented += 1
+            priority_stats_impl[priority]['total'] += 1
+            if is_covered:
+                covered_implemented += 1
+                priority_stats_impl[priority]['covered'] += 1
+
+    coverage_implemented_percentage = (covered_implemented / total_implemented * 100) if total_implemented > 0 else 0
 
-    # Generate priority coverage summary for both
+    # Generate priority coverage summary for both outputs in both formats
     priority_summary_all = ""
     priority_summary_impl = ""
+    priority_summary_all_html = ""
+    priority_summary_impl_html = ""
     for priority in ['Critical', 'High', 'Medium', 'Low', 'Unknown']:
         if priority in priority_stats_all:
             stats = priority_stats_all[priority]
             coverage_pct = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
             priority_summary_all += f"- **{priority}:** {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)\n"
+            priority_summary_all_html += f"- <strong>{priority}:</strong> {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)<br>"
         if priority in priority_stats_impl:
             stats = priority_stats_impl[priority]
             coverage_pct = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
             priority_summary_impl += f"- **{priority}:** {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)\n"
+            priority_summary_impl_html += f"- <strong>{priority}:</strong> {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)<br>"
 
-    # Generate the markdown content for conversion
-    markdown_content = f"""# Requirements Trace Matrix
-
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
-
-## Summary
-
-| Overall Project Metrics | Implemented Requirements Metrics |
-|-------------------------|----------------------------------|
-| **Total Rqmts:** {total_requirements} | **Total Rqmts:** {total_implemented} |
-| **Covered Rqmts:** {covered_requirements} | **Covered Rqmts:** {covered_implemented} |
-| **Coverage:** {coverage_percentage:.1f}% | **Coverage:** {coverage_implemented_percentage:.1f}% |
+    # Build the table rows as raw cell tuples; each serializer applies its
+    # own escaping (pipes for markdown, entities for HTML)
+    rows = []
 
-### Coverage by Priority
+    # Sort requirements by ID for consistent output
+    sorted_requirements = sorted(requirements.items())
 
-| Overall Project | Implemented Rqmts |
-|-----------------|-------------------|
-| {priority_summary_all.replace(os.linesep, '<br>')} | {priority_summary_impl.replace(os.linesep, '<br>')} |
+    for req_id, req in sorted_requirements:
+        priority = req['priority']
+        impl_status = req['impl_status']
 
-## Requirements Trace Matrix Table
+        # Clean up requirement text (remove any inline metadata) in a single pass
+        req_text = _CLEANUP_RE.sub('', req['text']).strip()
 
-| Requirement ID | Priority | Impl Status | Requirement Text | Test File | Test Case Function |
-|----------------|----------|-------------|------------------|-----------|-------------------|
-"""
-    
-    # Sort requirements by ID for consistent output
-    sorted_requirements = sorted(requirements.items())
-    
-    for req_id, description in sorted_requirements:
-        # Parse the description to extract priority and implementation status
-        priority = "Unknown"
-        impl_status = "Unknown"
-        req_text = description
-        
-        # Extract priority
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        if priority_match:
-            priority = priority_match.group(1)
-        
-        # Extract implementation status
-        impl_match = re.search(r'\*\*Impl Status\*\*:\s*([^-]+)', description)
-        if impl_match:
-            impl_status = impl_match.group(1).strip()
-        
-        # Clean up requirement text (remove metadata)
-        req_text = re.sub(r'\s*-\s*\*\*Priority\*\*:[^-]*', '', req_text)
-        req_text = re.sub(r'\s*-\s*\*\*Impl Status\*\*:[^-]*', '', req_text)
-        req_text = re.sub(r'\s*-\s*\*\*Verification\*\*:[^-]*', '', req_text)
-        req_text = req_text.strip()
-        
         # Handle test coverage
         if req_id in requirement_tests:
             # Create a row for each test case
             for file_path, test_method in requirement_tests[req_id]:
-                # Escape pipe characters in text for markdown table
-                safe_req_text = req_text.replace('|', '\\|')
-                safe_file_path = file_path.replace('|', '\\|')
-                safe_test_method = test_method.replace('|', '\\|')
-                
-                markdown_content += f"| {req_id} | {priority} | {impl_status} | {safe_req_text} | {safe_file_path} | {safe_test_method} |\n"
+                rows.append((req_id, priority, impl_status, req_text, file_path, test_method))
         else:
             # No test coverage
-            safe_req_text = req_text.replace('|', '\\|')
-            markdown_content += f"| {req_id} | {priority} | {impl_status} | {safe_req_text} | ❌ No test coverage | ❌ No test coverage |\n"
-    
-    markdown_content += f"""
-## Generation Details
+            rows.append((req_id, priority, impl_status, req_text, _NO_COVERAGE, _NO_COVERAGE))
+
+    return TraceMatrixModel(
+        timestamp=datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC'),
+        total_requirements=total_requirements,
+        covered_requirements=covered_requirements,
+        coverage_percentage=coverage_percentage,
+        total_implemented=total_implemented,
+        covered_implemented=covered_implemented,
+        coverage_implemented_percentage=coverage_implemented_percentage,
+        priority_summary_all=priority_summary_all,
+        priority_summary_impl=priority_summary_impl,
+        priority_summary_all_html=priority_summary_all_html,
+        priority_summary_impl_html=priority_summary_impl_html,
+        rows=rows,
+    )
+
+
+def _render_markdown_rows(rows: List[Tuple]) -> str:
+    """Serialize row tuples as markdown table rows with pipe escaping."""
+    parts = []
+    for req_id, priority, impl_status, req_text, file_path, test_method in rows:
+        parts.append(
+            f"| {req_id} | {priority} | {impl_status} "
+            f"| {req_text.translate(_PIPE_ESCAPE)} "
+            f"| {file_path.translate(_PIPE_ESCAPE)} "
+            f"| {test_method.translate(_PIPE_ESCAPE)} |\n")
+    return ''.join(parts)
+
+
+def _format_inline(escaped_text: str) -> str:
+    """Render the inline markdown found in requirement text (`code`,
+    **bold**, *emphasis*) on an already entity-escaped string."""
+    escaped_text = _CODE_SPAN_RE.sub(r'<code>\1</code>', escaped_text)
+    escaped_text = _BOLD_RE.sub(r'<strong>\1</strong>', escaped_text)
+    return _EMPHASIS_RE.sub(r'<em>\1</em>', escaped_text)
+
+
+def render_html(model: TraceMatrixModel, html_output_file: Path) -> str:
+    """Serialize the model as the dark-theme HTML trace matrix document."""
+    # Emit the table HTML directly — the input is fully under our control,
+    # so there is no need to build markdown and push it through a markdown
+    # parser just to get a <table> back. Cell values are entity-escaped;
+    # the requirement text additionally gets its inline markdown rendered.
+    row_parts = []
+    for req_id, priority, impl_status, req_text, file_path, test_method in model.rows:
+        row_parts.append(
+            f'<tr>'
+            f'<td>{html_escape(req_id)}</td>'
+            f'<td class="priority-{html_escape(priority.lower())}">{html_escape(priority)}</td>'
+            f'<td>{html_escape(impl_status)}</td>'
+            f'<td>{_format_inline(html_escape(req_text))}</td>'
+            f'<td>{html_escape(file_path)}</td>'
+            f'<td>{html_escape(test_method)}</td>'
+            f'</tr>\n')
+
+    return _HTML_TEMPLATE.substitute(
+        timestamp=model.timestamp,
+        total_requirements=model.total_requirements,
+        covered_requirements=model.covered_requirements,
+        coverage_percentage=f"{model.coverage_percentage:.1f}",
+        total_implemented=model.total_implemented,
+        covered_implemented=model.covered_implemented,
+        coverage_implemented_percentage=f"{model.coverage_implemented_percentage:.1f}",
+        priority_summary_all_html=model.priority_summary_all_html,
+        priority_summary_impl_html=model.priority_summary_impl_html,
+        rows_html=''.join(row_parts),
+        output_path=html_output_file.relative_to(find_project_root()),
+    )
+
+
+def generate_html_trace_matrix(model: TraceMatrixModel,
+                               html_output_file: Path) -> None:
+    """Generate the requirements trace matrix HTML file with dark theme."""
 
-- **Requirements Source:** `docs/process/02_operational_requirements.md`
-- **Test Directory:** `test/`
-- **Script:** `scripts/generate_trace_matrix.py`
-- **Output:** `{html_output_file.relative_to(find_project_root())}`
+    # Ensure output directory exists
+    html_output_file.parent.mkdir(parents=True, exist_ok=True)
 
-This trace matrix is automatically generated by scanning requirement ID comments in test files.
-To update coverage, add comments like `// TOR-1.1` to test assertions that validate specific requirements.
-"""
-    
-    # Convert markdown to HTML
-    md = markdown.Markdown(extensions=['tables'])
-    html_body = md.convert(markdown_content)
-    
-    # Create full HTML with dark theme
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Requirements Trace Matrix</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background-color: #1a1a1a;
-            color: #e0e0e0;
-            margin: 0;
-            padding: 20px;
-            line-height: 1.6;
-        }}
-        
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background-color: #2d2d2d;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-        }}
-        
-        h1 {{
-            color: #4CAF50;
-            border-bottom: 3px solid #4CAF50;
-            padding-bottom: 10px;
-            margin-bottom: 30px;
-        }}
-        
-        h2 {{
-            color: #81C784;
-            border-bottom: 2px solid #81C784;
-            padding-bottom: 8px;
-            margin-top: 40px;
-            margin-bottom: 20px;
-        }}
-        
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            background-color: #3d3d3d;
-            border-radius: 6px;
-            overflow: hidden;
-        }}
-        
-        th {{
-            background-color: #4CAF50;
-            color: white;
-            padding: 12px 8px;
-            text-align: left;
-            font-weight: 600;
-            border-bottom: 2px solid #45a049;
-        }}
-        
-        td {{
-            padding: 10px 8px;
-            border-bottom: 1px solid #555;
-            vertical-align: top;
-        }}
-        
-        /* Text wrapping for Test File and Test Case Function columns */
-        td:nth-child(5), td:nth-child(6) {{
-            word-wrap: break-word;
-            word-break: break-word;
-            max-width: 250px;
-            min-width: 150px;
-            white-space: normal;
-            overflow-wrap: break-word;
-            hyphens: auto;
-        }}
-        
-        /* Better readability for file paths - break at path separators */
-        td:nth-child(5) {{
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-        }}
-        
-        /* Better readability for function names */
-        td:nth-child(6) {{
-            font-family: 'Courier New', monospace;
-            font-size: 0.9em;
-        }}
-        
-        tr:nth-child(even) {{
-            background-color: #404040;
-        }}
-        
-        tr:hover {{
-            background-color: #4a4a4a;
-        }}
-        
-        .priority-critical {{
-            background-color: #d32f2f;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-            font-weight: bold;
-        }}
-        
-        .priority-high {{
-            background-color: #f57c00;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-            font-weight: bold;
-        }}
-        
-        .priority-medium {{
-            background-color: #1976d2;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-            font-weight: bold;
-        }}
-        
-        .priority-low {{
-            background-color: #388e3c;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-            font-weight: bold;
-        }}
-        
-        .status-implemented {{
-            background-color: #4CAF50;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-        }}
-        
-        .status-partial {{
-            background-color: #FF9800;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-        }}
-        
-        .status-not-implemented {{
-            background-color: #f44336;
-            color: white;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-size: 0.85em;
-        }}
-        
-        .no-coverage {{
-            color: #f44336;
-            font-weight: bold;
-        }}
-        
-        code {{
-            background-color: #555;
-            color: #e0e0e0;
-            padding: 2px 4px;
-            border-radius: 3px;
-            font-family: 'Courier New', monospace;
-        }}
-        
-        ul {{
-            margin: 10px 0;
-            padding-left: 20px;
-        }}
-        
-        li {{
-            margin: 5px 0;
-        }}
-        
-        strong {{
-            color: #81C784;
-        }}
-        
-        .summary-stats {{
-            background-color: #404040;
-            padding: 15px;
-            border-radius: 6px;
-            margin: 20px 0;
-        }}
-        
-        .generation-details {{
-            background-color: #404040;
-            padding: 15px;
-            border-radius: 6px;
-            margin: 20px 0;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        {html_body}
-    </div>
-    
-    <script>
-        // Add CSS classes based on content
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Style status cells (but not priority cells)
-            const cells = document.querySelectorAll('td');
-            cells.forEach(cell => {{
-                const text = cell.textContent.trim().toLowerCase();
-                if (text === 'implemented') {{
-                    cell.innerHTML = '<span class="status-implemented">Implemented</span>';
-                }} else if (text === 'partial') {{
-                    cell.innerHTML = '<span class="status-partial">Partial</span>';
-                }} else if (text === 'not implemented') {{
-                    cell.innerHTML = '<span class="status-not-implemented">Not Implemented</span>';
-                }} else if (text.includes('❌ no test coverage')) {{
-                    cell.classList.add('no-coverage');
-                }}
-            }});
-            
-            // Style summary section
-            const summarySection = document.querySelector('h2');
-            if (summarySection && summarySection.textContent.includes('Summary')) {{
-                const nextElement = summarySection.nextElementSibling;
-                if (nextElement && nextElement.tagName === 'UL') {{
-                    nextElement.classList.add('summary-stats');
-                }}
-            }}
-            
-            // Style generation details
-            const detailsSection = Array.from(document.querySelectorAll('h2')).find(h => h.textContent.includes('Generation Details'));
-            if (detailsSection) {{
-                const nextElement = detailsSection.nextElementSibling;
-                if (nextElement && nextElement.tagName === 'UL') {{
-                    nextElement.classList.add('generation-details');
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>"""
-    
-    # Write the HTML file
+    html_content = render_html(model, html_output_file)
+
+    # Encode once and write in a single binary call, skipping the
+    # TextIOWrapper codec and newline translation
     try:
-        with open(html_output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
+        html_output_file.write_bytes(html_content.encode('utf-8'))
+
         print(f"🌐 HTML trace matrix generated: {html_output_file}")
-        
+
     except Exception as e:
         print(f"❌ Error writing HTML output file: {e}")
         sys.exit(1)
 
 
-def generate_trace_matrix(requirements: Dict[str, str], 
-                         requirement_tests: Dict[str, List[Tuple[str, str]]],
-                         output_file: Path) -> None:
+def render_markdown(model: TraceMatrixModel, output_file: Path) -> str:
+    """Serialize the model as the markdown trace matrix document."""
+    return _MD_TEMPLATE.substitute(
+        timestamp=model.timestamp,
+        total_requirements=model.total_requirements,
+        covered_requirements=model.covered_requirements,
+        coverage_percentage=f"{model.coverage_percentage:.1f}",
+        total_implemented=model.total_implemented,
+        covered_implemented=model.covered_implemented,
+        coverage_implemented_percentage=f"{model.coverage_implemented_percentage:.1f}",
+        priority_summary_all=model.priority_summary_all.replace(os.linesep, '<br>'),
+        priority_summary_impl=model.priority_summary_impl.replace(os.linesep, '<br>'),
+        rows=_render_markdown_rows(model.rows),
+        output_path=output_file.relative_to(find_project_root()),
+    )
+
+
+def generate_trace_matrix(model: TraceMatrixModel, output_file: Path) -> None:
     """Generate the requirements trace matrix markdown file."""
-    
+
     # Ensure output directory exists
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Calculate coverage statistics
-    total_requirements = len(requirements)
-    covered_requirements = len([req_id for req_id in requirements.keys() if req_id in requirement_tests])
-    coverage_percentage = (covered_requirements / total_requirements * 100) if total_requirements > 0 else 0
-    
-    # Calculate coverage by priority
-    priority_stats = {}
-    for req_id, description in requirements.items():
-        # Extract priority
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        
-        if priority not in priority_stats:
-            priority_stats[priority] = {'total': 0, 'covered': 0}
-        
-        priority_stats[priority]['total'] += 1
-        if req_id in requirement_tests:
-            priority_stats[priority]['covered'] += 1
-    
-    # Calculate stats for implemented requirements
-    implemented_reqs = {req_id: desc for req_id, desc in requirements.items() if "Impl Status**: Implemented" in desc}
-    total_implemented = len(implemented_reqs)
-    covered_implemented = len([req_id for req_id in implemented_reqs.keys() if req_id in requirement_tests])
-    coverage_implemented_percentage = (covered_implemented / total_implemented * 100) if total_implemented > 0 else 0
 
-    # Calculate coverage by priority for all requirements
-    priority_stats_all = {}
-    for req_id, description in requirements.items():
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        if priority not in priority_stats_all:
-            priority_stats_all[priority] = {'total': 0, 'covered': 0}
-        priority_stats_all[priority]['total'] += 1
-        if req_id in requirement_tests:
-            priority_stats_all[priority]['covered'] += 1
+    content = render_markdown(model, output_file)
 
-    # Calculate coverage by priority for implemented requirements
-    priority_stats_impl = {}
-    for req_id, description in implemented_reqs.items():
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        priority = priority_match.group(1) if priority_match else "Unknown"
-        if priority not in priority_stats_impl:
-            priority_stats_impl[priority] = {'total': 0, 'covered': 0}
-        priority_stats_impl[priority]['total'] += 1
-        if req_id in requirement_tests:
-            priority_stats_impl[priority]['covered'] += 1
-
-    # Generate priority coverage summary for both
-    priority_summary_all = ""
-    priority_summary_impl = ""
-    for priority in ['Critical', 'High', 'Medium', 'Low', 'Unknown']:
-        if priority in priority_stats_all:
-            stats = priority_stats_all[priority]
-            coverage_pct = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            priority_summary_all += f"- **{priority}:** {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)\n"
-        if priority in priority_stats_impl:
-            stats = priority_stats_impl[priority]
-            coverage_pct = (stats['covered'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            priority_summary_impl += f"- **{priority}:** {stats['covered']}/{stats['total']} ({coverage_pct:.1f}%)\n"
-
-    # Generate the markdown content
-    content = f"""# Requirements Trace Matrix
-
-**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}
+    # Encode once and write in a single binary call, skipping the
+    # TextIOWrapper codec and newline translation
+    try:
+        output_file.write_bytes(content.encode('utf-8'))
 
-## Summary
+        print(f"✅ Requirements trace matrix generated: {output_file}")
+        print(f"📊 Coverage: {model.covered_requirements}/{model.total_requirements} requirements ({model.coverage_percentage:.1f}%)")
 
-| Overall Project Metrics | Implemented Requirements Metrics |
-|-------------------------|----------------------------------|
-| **Total Rqmts:** {total_requirements} | **Total Rqmts:** {total_implemented} |
-| **Covered Rqmts:** {covered_requirements} | **Covered Rqmts:** {covered_implemented} |
-| **Coverage:** {coverage_percentage:.1f}% | **Coverage:** {coverage_implemented_percentage:.1f}% |
+    except Exception as e:
+        print(f"❌ Error writing output file: {e}")
+        sys.exit(1)
 
-### Coverage by Priority
 
-| Overall Project | Implemented Rqmts |
-|-----------------|-------------------|
-| {priority_summary_all.replace(os.linesep, '<br>')} | {priority_summary_impl.replace(os.linesep, '<br>')} |
+def _compute_inputs_hash(requirements_file: Path, test_directories: List[Path]) -> str:
+    """
+    Digest this script, the requirements file and output template contents,
+    plus the (path, mtime_ns, size) of every scanned test file. If nothing
+    changed since the last run, the outputs cannot change either and
+    regeneration can be skipped.
+    """
+    digest = hashlib.blake2b(digest_size=16)
 
-## Requirements Trace Matrix Table
+    for input_file in [Path(__file__), requirements_file,
+                       *sorted(_TEMPLATE_DIR.glob('*.tmpl'))]:
+        try:
+            digest.update(input_file.read_bytes())
+        except OSError:
+            pass
 
-| Requirement ID | Priority | Implementation Status | Requirement Text | Test File | Test Case Function |
-|----------------|----------|----------------------|------------------|-----------|-------------------|
-"""
-    
-    # Sort requirements by ID for consistent output
-    sorted_requirements = sorted(requirements.items())
-    
-    for req_id, description in sorted_requirements:
-        # Parse the description to extract priority and implementation status
-        priority = "Unknown"
-        impl_status = "Unknown"
-        req_text = description
-        
-        # Extract priority
-        priority_match = re.search(r'\*\*Priority\*\*:\s*(\w+)', description)
-        if priority_match:
-            priority = priority_match.group(1)
-        
-        # Extract implementation status
-        impl_match = re.search(r'\*\*Impl Status\*\*:\s*([^-]+)', description)
-        if impl_match:
-            impl_status = impl_match.group(1).strip()
-        
-        # Clean up requirement text (remove metadata)
-        req_text = re.sub(r'\s*-\s*\*\*Priority\*\*:[^-]*', '', req_text)
-        req_text = re.sub(r'\s*-\s*\*\*Impl Status\*\*:[^-]*', '', req_text)
-        req_text = re.sub(r'\s*-\s*\*\*Verification\*\*:[^-]*', '', req_text)
-        req_text = req_text.strip()
-        
-        # Handle test coverage
-        if req_id in requirement_tests:
-            # Create a row for each test case
-            for file_path, test_method in requirement_tests[req_id]:
-                # Escape pipe characters in text for markdown table
-                safe_req_text = req_text.replace('|', '\\|')
-                safe_file_path = file_path.replace('|', '\\|')
-                safe_test_method = test_method.replace('|', '\\|')
-                
-                content += f"| {req_id} | {priority} | {impl_status} | {safe_req_text} | {safe_file_path} | {safe_test_method} |\n"
-        else:
-            # No test coverage
-            safe_req_text = req_text.replace('|', '\\|')
-            content += f"| {req_id} | {priority} | {impl_status} | {safe_req_text} | ❌ No test coverage | ❌ No test coverage |\n"
-    
-    content += f"""
-## Generation Details
+    entries = []
+    for test_directory in test_directories:
+        if test_directory.exists():
+            for test_file in _iter_cs_files(test_directory):
+                try:
+                    st = test_file.stat()
+                    entries.append((str(test_file), st.st_mtime_ns, st.st_size))
+                except OSError:
+                    continue
 
-- **Requirements Source:** `docs/process/02_operational_requirements.md`
-- **Test Directory:** `test/`
-- **Script:** `scripts/generate_trace_matrix.py`
-- **Output:** `{output_file.relative_to(find_project_root())}`
+    for entry in sorted(entries):
+        digest.update(repr(entry).encode('utf-8'))
 
-This trace matrix is automatically generated by scanning requirement ID comments in test files.
-To update coverage, add comments like `// TOR-1.1` to test assertions that validate specific requirements.
-"""
-    
-    # Write the file
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        print(f"✅ Requirements trace matrix generated: {output_file}")
-        print(f"📊 Coverage: {covered_requirements}/{total_requirements} requirements ({coverage_percentage:.1f}%)")
-        
-    except Exception as e:
-        print(f"❌ Error writing output file: {e}")
-        sys.exit(1)
+    return digest.hexdigest()
 
 
 def main():
     """Main function to generate the requirements trace matrix."""
     print("🚀 Generating Requirements Trace Matrix...")
-    
-    # Check for required dependencies early
-    if not MARKDOWN_AVAILABLE:
-        print("❌ Error: 'markdown' package is required for HTML generation.")
-        print("📦 Install it with: pip install markdown")
-        sys.exit(1)
-    
+
     # Find project root
     project_root = find_project_root()
     print(f"📁 Project root: {project_root}")
@@ -750,7 +602,19 @@ def main():
     ]
     output_file = project_root / "outputs" / "latest_rqmts_trace_matrix.md"
     html_output_file = project_root / "outputs" / "latest_rqmts_trace_matrix.html"
-    
+    hash_file = project_root / "outputs" / ".trace_inputs.hash"
+
+    # Skip regeneration entirely when neither the requirements file nor any
+    # test file changed since the outputs were last written
+    inputs_hash = _compute_inputs_hash(requirements_file, test_directories)
+    if output_file.exists() and html_output_file.exists():
+        try:
+            if hash_file.read_text(encoding='utf-8').strip() == inputs_hash:
+                print("✨ Inputs unchanged; outputs are up-to-date.")
+                return
+        except OSError:
+            pass
+
     # Parse requirements
     print("📋 Parsing requirements...")
     requirements = parse_requirements(requirements_file)
@@ -763,14 +627,23 @@ def main():
     print("🔍 Scanning test files...")
     requirement_tests = scan_test_files(test_directories)
     
+    # Build the model once; both outputs render from it
+    model = _build_model(requirements, requirement_tests)
+
     # Generate trace matrix (markdown)
     print("📝 Generating markdown trace matrix...")
-    generate_trace_matrix(requirements, requirement_tests, output_file)
-    
+    generate_trace_matrix(model, output_file)
+
     # Generate HTML trace matrix
     print("🌐 Generating HTML trace matrix...")
-    generate_html_trace_matrix(requirements, requirement_tests, html_output_file)
-    
+    generate_html_trace_matrix(model, html_output_file)
+
+    # Record the inputs hash so unchanged reruns can short-circuit
+    try:
+        hash_file.write_text(inputs_hash, encoding='utf-8')
+    except OSError as e:
+        print(f"Warning: Could not write inputs hash: {e}")
+
     print("🎉 Trace matrix generation complete!")
 
 